@@ -1,8 +1,102 @@
 import streamlit as st
-import random
+import html
 import json
+import mmap
 import os
-from datetime import datetime
+from collections import Counter, defaultdict
+from bisect import bisect_right
+from itertools import accumulate
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Page-wide styles for the answer radio buttons and detailed result cards
+CSS_BLOCK = """
+<style>
+.stRadio > div {
+    font-size: 1.2rem !important;
+    line-height: 1.5 !important;
+    text-align: center !important;
+}
+.stRadio > div > label {
+    font-size: 1.2rem !important;
+    padding: 8px 0 !important;
+    justify-content: center !important;
+    text-align: center !important;
+}
+.stRadio > div > label > div {
+    font-size: 1.2rem !important;
+    text-align: center !important;
+}
+.stRadio > div > label > div:first-child {
+    margin-right: 8px !important;
+}
+.result-answers {
+    display: grid;
+    grid-template-columns: 1fr 1fr;
+    gap: 1rem;
+}
+.result-box {
+    padding: 0.75rem 1rem;
+    border-radius: 0.5rem;
+    margin-bottom: 1rem;
+}
+.result-correct {
+    background-color: rgba(33, 195, 84, 0.15);
+}
+.result-wrong {
+    background-color: rgba(255, 43, 43, 0.15);
+}
+.result-info {
+    background-color: rgba(28, 131, 225, 0.15);
+}
+</style>
+"""
+
+# HTML templates for the question currently being answered
+QUESTION_HEADER_TEMPLATE = """
+<div style='text-align: center; margin-bottom: 20px;'>
+    <h2>Question {number} {difficulty_emoji} {category_emoji}</h2>
+    <p style='color: #888; font-size: 0.9rem;'>{difficulty} • {category}</p>
+</div>
+"""
+
+QUESTION_TEXT_TEMPLATE = """
+<div style='text-align: center; margin: 30px 0; padding: 20px;'>
+    <h3 style='color: #ffffff; font-size: 1.5rem; line-height: 1.4;'>{question}</h3>
+</div>
+"""
+
+# Lookup tables for difficulty and category display, keyed by normalized (lowercase) name
+DIFFICULTY_EMOJIS = {
+    'easy': '🟢',
+    'medium': '🟡', 
+    'hard': '🔴'
+}
+
+CATEGORY_EMOJIS = {
+    'history': '📚',
+    'drivers': '👤',
+    'tracks': '🏁',
+    'cars': '🏎️',
+    'records': '🏆',
+    'rules': '📋',
+    'teams': '👥',
+    'general': '🎯',
+    'unknown': '❓'
+}
+
+# Points per correct answer for the weighted score
+DIFFICULTY_WEIGHTS = {'easy': 1, 'medium': 2, 'hard': 3}
+
+# Question files at least this large are memory-mapped instead of read into a buffer
+MMAP_THRESHOLD_BYTES = 1024 * 1024
+
+# Number of detailed results rendered before the "Show all" button
+RESULTS_PREVIEW_COUNT = 5
 
 # Basic Page Configuration
 st.set_page_config(
@@ -11,34 +105,57 @@ st.set_page_config(
     layout="wide"
 )
 
+# Streamlit clears elements a run doesn't emit, so the styles go out on every run
+st.markdown(CSS_BLOCK, unsafe_allow_html=True)
+
 # Initialize session state
 if 'quiz_started' not in st.session_state:
     st.session_state.quiz_started = False
 if 'current_question' not in st.session_state:
     st.session_state.current_question = 0
-if 'score' not in st.session_state:
-    st.session_state.score = 0
 if 'answers' not in st.session_state:
     st.session_state.answers = []
 if 'quiz_questions' not in st.session_state:
     st.session_state.quiz_questions = []
-if 'questions_loaded' not in st.session_state:
-    st.session_state.questions_loaded = False
-if 'all_questions' not in st.session_state:
-    st.session_state.all_questions = []
+if 'show_all_results' not in st.session_state:
+    st.session_state.show_all_results = False
 if 'selected_difficulty' not in st.session_state:
     st.session_state.selected_difficulty = 'mixed'
 if 'selected_category' not in st.session_state:
     st.session_state.selected_category = 'all'
 
-@st.cache_data
-def load_questions_from_json(file_path="questions.json"):
-    """Load questions from JSON file with caching"""
+def get_questions_mtime(file_path="questions.json"):
+    """Get the questions file modification time to use as a cache key"""
+    try:
+        return os.path.getmtime(file_path)
+    except OSError:
+        return 0
+
+def parse_json_file(file_path):
+    """Parse a JSON file, memory-mapping large files when orjson is available"""
+    path = Path(file_path)
+    # orjson parses straight from the mapped pages, skipping a full copy into Python bytes
+    if orjson and path.stat().st_size >= MMAP_THRESHOLD_BYTES:
+        with path.open('rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+            return orjson.loads(view)
+    raw = path.read_bytes()
+    # orjson is a much faster parser; its errors subclass json.JSONDecodeError
+    return orjson.loads(raw) if orjson else json.loads(raw)
+
+# One entry: a new mtime evicts the previous parse instead of keeping it resident
+@st.cache_resource(show_spinner=False, max_entries=1)
+def load_questions_from_json(file_path="questions.json", mtime=0):
+    """Load questions from JSON file once per path and mtime, shared read-only"""
     try:
         if os.path.exists(file_path):
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                return data.get('questions', [])
+            data = parse_json_file(file_path)
+            questions = data.get('questions', [])
+            
+            # Normalize filter keys once so render paths don't lowercase per question
+            for question in questions:
+                question['_diff'] = (question.get('difficulty') or 'unknown').lower()
+                question['_cat'] = (question.get('category') or 'unknown').lower()
+            return questions
         else:
             st.error(f"Questions file '{file_path}' not found. Please make sure the file exists in the same directory as this script.")
             return []
@@ -49,216 +166,207 @@ def load_questions_from_json(file_path="questions.json"):
         st.error(f"Error loading questions: {e}")
         return []
 
-def initialize_questions():
-    """Initialize questions from JSON file"""
-    if not st.session_state.questions_loaded:
-        st.session_state.all_questions = load_questions_from_json()
-        st.session_state.questions_loaded = True
-        
-        if not st.session_state.all_questions:
-            st.warning("No questions loaded. Please check your questions file.")
-            return False
-    return True
+def build_question_index(questions):
+    """Bucket question indices by (category, difficulty) and tally stats from the buckets"""
+    buckets = defaultdict(list)
+    for i, question in enumerate(questions):
+        buckets[(question['_cat'], question['_diff'])].append(i)
 
-def filter_questions_by_difficulty(questions, difficulty_level):
-    """Filter questions based on selected difficulty"""
-    if difficulty_level == 'mixed':
-        return questions
-    
-    filtered_questions = [
-        q for q in questions 
-        if q.get('difficulty', '').lower() == difficulty_level.lower()
-    ]
-    
-    return filtered_questions
+    # Totals come from bucket sizes, so there's no per-question counting
+    difficulty_stats = Counter()
+    category_stats = Counter()
+    for (category, difficulty), indices in buckets.items():
+        difficulty_stats[difficulty] += len(indices)
+        category_stats[category] += len(indices)
 
-def filter_questions_by_category(questions, category):
-    """Filter questions based on selected category"""
-    if category == 'all':
-        return questions
-    
-    filtered_questions = [
-        q for q in questions 
-        if q.get('category', '').lower() == category.lower()
-    ]
-    
-    return filtered_questions
+    return {
+        'total': len(questions),
+        'buckets': dict(buckets),
+        'categories': sorted(category_stats),
+        'difficulty_stats': difficulty_stats,
+        'category_stats': category_stats
+    }
 
-def get_available_categories():
-    """Get list of available categories"""
-    if not st.session_state.all_questions:
-        return []
-    
-    categories = set()
-    for question in st.session_state.all_questions:
-        category = question.get('category', 'Unknown')
-        if category:
-            categories.add(category)
-    
-    return sorted(list(categories))
+@st.cache_resource(show_spinner=False, max_entries=1)
+def get_question_index(mtime):
+    """Build the question index once per mtime and share it across sessions"""
+    return build_question_index(load_questions_from_json(mtime=mtime))
 
-def get_difficulty_stats():
-    """Get statistics about questions by difficulty"""
-    if not st.session_state.all_questions:
-        return {}
-    
-    stats = {}
-    for question in st.session_state.all_questions:
-        difficulty = question.get('difficulty', 'unknown').lower()
-        stats[difficulty] = stats.get(difficulty, 0) + 1
-    
-    return stats
+def clear_question_cache():
+    """Drop the shared questions so the next access reloads the file"""
+    load_questions_from_json.clear()
+    get_question_index.clear()
+    get_selection_options.clear()
 
-def get_category_stats():
-    """Get statistics about questions by category"""
-    if not st.session_state.all_questions:
-        return {}
-    
-    stats = {}
-    for question in st.session_state.all_questions:
-        category = question.get('category', 'Unknown')
-        stats[category] = stats.get(category, 0) + 1
-    
-    return stats
+def initialize_questions(mtime):
+    """Initialize questions from JSON file"""
+    if not load_questions_from_json(mtime=mtime):
+        # Don't keep an empty result around for every session
+        clear_question_cache()
+        st.warning("No questions loaded. Please check your questions file.")
+        return False
+    return True
 
-def get_filtered_question_count(difficulty, category):
+def get_matching_buckets(mtime, difficulty, category):
+    """Get the index buckets matching both difficulty and category filters"""
+    category = category.lower()
+    difficulty = difficulty.lower()
+
+    return [
+        indices
+        for (cat, diff), indices in get_question_index(mtime)['buckets'].items()
+        if (category == 'all' or cat == category)
+        and (difficulty == 'mixed' or diff == difficulty)
+    ]
+
+def get_filtered_question_count(mtime, difficulty, category):
     """Get count of questions matching both difficulty and category filters"""
-    questions = st.session_state.all_questions
-    
-    # Apply category filter
-    if category != 'all':
-        questions = [q for q in questions if q.get('category', '').lower() == category.lower()]
-    
-    # Apply difficulty filter
-    if difficulty != 'mixed':
-        questions = [q for q in questions if q.get('difficulty', '').lower() == difficulty.lower()]
-    
-    return len(questions)
+    if category == 'all' and difficulty == 'mixed':
+        return get_question_index(mtime)['total']
 
-def calculate_difficulty_score(answers):
-    """Calculate score with difficulty weighting"""
+    # Sum bucket sizes instead of scanning every question
+    return sum(len(indices) for indices in get_matching_buckets(mtime, difficulty, category))
+
+def summarize_answers(answers, questions):
+    """Tally per-category and per-difficulty results and the weighted score in one pass"""
+    category_breakdown = defaultdict(lambda: [0, 0])  # category -> [correct, total]
+    difficulty_results = Counter()  # (difficulty, is_correct) -> count
     total_weighted_score = 0
     max_possible_score = 0
     
-    difficulty_weights = {'easy': 1, 'medium': 2, 'hard': 3}
-    
-    for i, answer in enumerate(answers):
-        question = st.session_state.quiz_questions[i]
-        difficulty = question.get('difficulty', 'medium').lower()
-        weight = difficulty_weights.get(difficulty, 2)
+    # Answers are recorded in quiz order, so they pair up with the questions directly
+    for answer, question in zip(answers, questions):
+        cat = question['_cat']
+        diff = question['_diff']
+        weight = DIFFICULTY_WEIGHTS.get(diff, 2)
+        is_correct = answer['is_correct']
+        
+        category_breakdown[cat][1] += 1
+        category_breakdown[cat][0] += is_correct
+        
+        difficulty_results[diff, is_correct] += 1
         
         max_possible_score += weight
-        if answer['is_correct']:
+        if is_correct:
             total_weighted_score += weight
     
-    return total_weighted_score, max_possible_score
+    return category_breakdown, difficulty_results, total_weighted_score, max_possible_score
 
-def start_quiz(difficulty_level='mixed', category='all'):
+def sample_from_buckets(buckets, num_questions):
+    """Sample question indices across buckets without concatenating them"""
+    # Only needed when a quiz starts, so keep it off the script's import path
+    import random
+    
+    offsets = list(accumulate(len(indices) for indices in buckets))
+    
+    sampled = []
+    # Pick positions in the virtual concatenation, then map each back into its bucket
+    for position in random.sample(range(offsets[-1]), num_questions):
+        bucket = bisect_right(offsets, position)
+        start = offsets[bucket - 1] if bucket else 0
+        sampled.append(buckets[bucket][position - start])
+    return sampled
+
+def start_quiz(mtime, difficulty_level='mixed', category='all'):
     """Initialize a new quiz session with difficulty and category selection"""
-    if not st.session_state.all_questions:
+    all_questions = load_questions_from_json(mtime=mtime)
+    if not all_questions:
         st.error("Cannot start quiz: No questions available.")
         return False
     
-    # Filter questions by category first, then difficulty
-    available_questions = filter_questions_by_category(st.session_state.all_questions, category)
-    available_questions = filter_questions_by_difficulty(available_questions, difficulty_level)
+    # Matching question indices stay in their precomputed buckets
+    buckets = get_matching_buckets(mtime, difficulty_level, category)
+    available_count = sum(len(indices) for indices in buckets)
     
-    if not available_questions:
+    if not available_count:
         st.error(f"No questions available for {difficulty_level} difficulty in {category} category.")
         return False
     
-    if len(available_questions) < 5:
-        st.warning(f"Only {len(available_questions)} questions available for {difficulty_level} difficulty in {category} category.")
+    if available_count < 5:
+        st.warning(f"Only {available_count} questions available for {difficulty_level} difficulty in {category} category.")
         
     st.session_state.quiz_started = True
     st.session_state.current_question = 0
-    st.session_state.score = 0
     st.session_state.answers = []
+    st.session_state.show_all_results = False
     st.session_state.selected_difficulty = difficulty_level
     st.session_state.selected_category = category
     
-    # Randomize questions for each quiz
-    num_questions = min(5, len(available_questions))
-    st.session_state.quiz_questions = random.sample(available_questions, num_questions)
+    # Randomize questions for each quiz, only dereferencing the sampled indices
+    num_questions = min(5, available_count)
+    st.session_state.quiz_questions = [all_questions[i] for i in sample_from_buckets(buckets, num_questions)]
     return True
 
+def current_score():
+    """Get the number of correct answers so far"""
+    return sum(answer['is_correct'] for answer in st.session_state.answers)
+
 def submit_answer(selected_option):
     """Process the submitted answer"""
-    current_q = st.session_state.quiz_questions[st.session_state.current_question]
+    question_number = st.session_state.current_question
+    current_q = st.session_state.quiz_questions[question_number]
     is_correct = selected_option == current_q["correct"]
     
-    if is_correct:
-        st.session_state.score += 1
-    
+    # Keep answers lean; they pair with quiz_questions by position for question details
     st.session_state.answers.append({
-        "question": current_q["question"],
         "selected": selected_option,
-        "correct": current_q["correct"],
-        "is_correct": is_correct,
-        "explanation": current_q["explanation"],
-        "difficulty": current_q.get("difficulty", "medium"),
-        "category": current_q.get("category", "Unknown")
+        "is_correct": is_correct
     })
     
-    st.session_state.current_question += 1
+    st.session_state.current_question = question_number + 1
 
 def reset_quiz():
     """Reset the quiz to start over"""
     st.session_state.quiz_started = False
     st.session_state.current_question = 0
-    st.session_state.score = 0
     st.session_state.answers = []
     st.session_state.quiz_questions = []
+    st.session_state.show_all_results = False
 
-def get_difficulty_emoji(difficulty):
-    """Get emoji for difficulty level"""
-    difficulty_emojis = {
-        'easy': '🟢',
-        'medium': '🟡', 
-        'hard': '🔴'
-    }
-    return difficulty_emojis.get(difficulty.lower(), '⚪')
-
-def get_category_emoji(category):
-    """Get emoji for category"""
-    category_emojis = {
-        'history': '📚',
-        'drivers': '👤',
-        'tracks': '🏁',
-        'cars': '🏎️',
-        'records': '🏆',
-        'rules': '📋',
-        'teams': '👥',
-        'general': '🎯',
-        'unknown': '❓'
-    }
-    return category_emojis.get(category.lower(), '🎯')
-
-def get_difficulty_color(difficulty):
-    """Get color for difficulty level"""
-    difficulty_colors = {
-        'easy': 'green',
-        'medium': 'orange',
-        'hard': 'red'
-    }
-    return difficulty_colors.get(difficulty.lower(), 'gray')
+@st.cache_resource(show_spinner=False, max_entries=1)
+def get_selection_options(mtime):
+    """Build selectbox labels and per-selection question counts once per mtime"""
+    question_index = get_question_index(mtime)
+    category_stats = question_index['category_stats']
+    category_options = {'all': f"🎯 All Categories ({question_index['total']} questions)"}
+    for category in question_index['categories']:
+        emoji = CATEGORY_EMOJIS.get(category, '🎯')
+        count = category_stats.get(category, 0)
+        category_options[category] = f"{emoji} {category.title()} ({count} questions)"
+    
+    difficulty_options_by_category = {}
+    question_counts = {}  # (category, difficulty) -> matching questions
+    for category in category_options:
+        available_count = get_filtered_question_count(mtime, 'mixed', category)
+        question_counts[category, 'mixed'] = available_count
+        difficulty_options = {
+            'mixed': f"🎲 Mixed Difficulty ({available_count} questions)"
+        }
+        
+        for difficulty in ['easy', 'medium', 'hard']:
+            count = get_filtered_question_count(mtime, difficulty, category)
+            if count > 0:
+                question_counts[category, difficulty] = count
+                emoji = DIFFICULTY_EMOJIS.get(difficulty, '⚪')
+                difficulty_options[difficulty] = f"{emoji} {difficulty.title()} ({count} questions)"
+        
+        difficulty_options_by_category[category] = difficulty_options
+    
+    return category_options, difficulty_options_by_category, question_counts
 
 # Main App Layout
 st.title("🏁 NASCQUIZ")
 st.markdown("---")
 
+# One stat per run: a changed mtime misses every questions cache, so edits show up on the next rerun
+questions_mtime = get_questions_mtime()
+
 # Initialize questions from JSON file
-if not initialize_questions():
+if not initialize_questions(questions_mtime):
     st.stop()
 
-# Get available categories and stats
-available_categories = get_available_categories()
-difficulty_stats = get_difficulty_stats()
-category_stats = get_category_stats()
-
-# Display question statistics
-if st.session_state.all_questions:
-    total_questions = len(st.session_state.all_questions)
+# Question totals and stats, computed once when the questions are loaded
+question_index = get_question_index(questions_mtime)
 
 # Quiz not started - Welcome screen with difficulty and category selection
 if not st.session_state.quiz_started:
@@ -277,37 +385,24 @@ if not st.session_state.quiz_started:
         
         # Category selection
         st.markdown("**Choose your category:**")
-        category_options = {'all': f"🎯 All Categories ({total_questions} questions)"}
-        for category in available_categories:
-            emoji = get_category_emoji(category)
-            count = category_stats.get(category, 0)
-            category_options[category] = f"{emoji} {category.title()} ({count} questions)"
+        category_options, difficulty_options_by_category, question_counts = get_selection_options(questions_mtime)
         
         selected_category = st.selectbox(
             "Select category:",
-            options=list(category_options.keys()),
-            format_func=lambda x: category_options[x],
+            options=category_options,
+            format_func=category_options.__getitem__,
             index=0,
             key="category_select"
         )
         
         # Difficulty selection (updated based on category)
         st.markdown("**Choose your difficulty:**")
-        available_count = get_filtered_question_count('mixed', selected_category)
-        difficulty_options = {
-            'mixed': f"🎲 Mixed Difficulty ({available_count} questions)"
-        }
-        
-        for difficulty in ['easy', 'medium', 'hard']:
-            count = get_filtered_question_count(difficulty, selected_category)
-            if count > 0:
-                emoji = get_difficulty_emoji(difficulty)
-                difficulty_options[difficulty] = f"{emoji} {difficulty.title()} ({count} questions)"
+        difficulty_options = difficulty_options_by_category[selected_category]
         
         selected_difficulty = st.selectbox(
             "Select difficulty:",
-            options=list(difficulty_options.keys()),
-            format_func=lambda x: difficulty_options[x],
+            options=difficulty_options,
+            format_func=difficulty_options.__getitem__,
             index=0,
             key="difficulty_select"
         )
@@ -317,7 +412,7 @@ if not st.session_state.quiz_started:
         
         with col_info1:
             if selected_category != 'all':
-                category_emoji = get_category_emoji(selected_category)
+                category_emoji = CATEGORY_EMOJIS.get(selected_category, '🎯')
                 st.info(f"{category_emoji} **{selected_category.title()}**: Questions focused on this specific NASCAR topic!")
             else:
                 st.info("🎯 **All Categories**: Questions from all NASCAR topics - comprehensive challenge!")
@@ -333,7 +428,7 @@ if not st.session_state.quiz_started:
                 st.info("🎲 **Mixed**: Questions from all difficulty levels - balanced challenge!")
         
         # Show final question count
-        final_count = get_filtered_question_count(selected_difficulty, selected_category)
+        final_count = question_counts[selected_category, selected_difficulty]
         if final_count < 5:
             st.warning(f"⚠️ Only {final_count} questions available with current selections. Consider broadening your criteria.")
         else:
@@ -342,103 +437,90 @@ if not st.session_state.quiz_started:
         st.markdown("Ready to put your NASCAR knowledge to the test?")
         
         if st.button("🚀 Start Quiz", type="primary", use_container_width=True, disabled=final_count == 0):
-            if start_quiz(selected_difficulty, selected_category):
+            if start_quiz(questions_mtime, selected_difficulty, selected_category):
                 st.rerun()
 
 # Quiz in progress
 elif st.session_state.current_question < len(st.session_state.quiz_questions):
-    current_q = st.session_state.quiz_questions[st.session_state.current_question]
-    current_difficulty = current_q.get('difficulty', 'medium')
-    current_category = current_q.get('category', 'Unknown')
+    # Bind session state once; each attribute access goes through Streamlit's proxy
+    quiz_questions = st.session_state.quiz_questions
+    question_number = st.session_state.current_question
+    num_questions = len(quiz_questions)
+    
+    current_q = quiz_questions[question_number]
+    current_difficulty = current_q['_diff']
+    current_category = current_q['_cat']
     
     # Progress bar
-    progress = (st.session_state.current_question) / len(st.session_state.quiz_questions)
-    st.progress(progress, text=f"Question {st.session_state.current_question + 1} of {len(st.session_state.quiz_questions)}")
+    progress = question_number / num_questions
+    st.progress(progress, text=f"Question {question_number + 1} of {num_questions}")
     
     # Centered current score
     col1, col2, col3 = st.columns([1, 1, 1])
     with col2:
-        st.metric("Current Score", f"{st.session_state.score}/{st.session_state.current_question}")
+        st.metric("Current Score", f"{current_score()}/{question_number}")
     
     # Centered question with bigger text
     st.markdown("<br>", unsafe_allow_html=True)  # Add some space
     
     # Center the question number, difficulty, and category indicators
-    category_emoji = get_category_emoji(current_category)
-    difficulty_emoji = get_difficulty_emoji(current_difficulty)
-    st.markdown(f"""
-    <div style='text-align: center; margin-bottom: 20px;'>
-        <h2>Question {st.session_state.current_question + 1} {difficulty_emoji} {category_emoji}</h2>
-        <p style='color: #888; font-size: 0.9rem;'>{current_difficulty.title()} • {current_category.title()}</p>
-    </div>
-    """, unsafe_allow_html=True)
+    category_emoji = CATEGORY_EMOJIS.get(current_category, '🎯')
+    difficulty_emoji = DIFFICULTY_EMOJIS.get(current_difficulty, '⚪')
+    st.markdown(QUESTION_HEADER_TEMPLATE.format(
+        number=question_number + 1,
+        difficulty_emoji=difficulty_emoji,
+        category_emoji=category_emoji,
+        difficulty=current_difficulty.title(),
+        category=current_category.title()
+    ), unsafe_allow_html=True)
     
     # Center the question text with bigger font
-    st.markdown(f"""
-    <div style='text-align: center; margin: 30px 0; padding: 20px;'>
-        <h3 style='color: #ffffff; font-size: 1.5rem; line-height: 1.4;'>{current_q['question']}</h3>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(QUESTION_TEXT_TEMPLATE.format(question=current_q['question']), unsafe_allow_html=True)
     
     st.markdown("<br>", unsafe_allow_html=True)  # Add space before options
     
-    # Answer options with bigger text, centered, and no preselection
-    col1, col2, col3 = st.columns([0.5, 3, 0.5])
-    with col2:
-        # Style the radio button labels with bigger text and center them
-        st.markdown("""
-        <style>
-        .stRadio > div {
-            font-size: 1.2rem !important;
-            line-height: 1.5 !important;
-            text-align: center !important;
-        }
-        .stRadio > div > label {
-            font-size: 1.2rem !important;
-            padding: 8px 0 !important;
-            justify-content: center !important;
-            text-align: center !important;
-        }
-        .stRadio > div > label > div {
-            font-size: 1.2rem !important;
-            text-align: center !important;
-        }
-        .stRadio > div > label > div:first-child {
-            margin-right: 8px !important;
-        }
-        </style>
-        """, unsafe_allow_html=True)
+    # Answer options and submit share a form, so picking an option doesn't rerun the script
+    with st.form(f"question_form_{question_number}", border=False):
+        # Answer options with bigger text, centered, and no preselection
+        # The bound __getitem__ labels each index without a Python lambda frame per option
+        options = current_q["options"]
+        col1, col2, col3 = st.columns([0.5, 3, 0.5])
+        with col2:
+            selected_option = st.radio(
+                "Choose your answer:",
+                options=range(len(options)),
+                format_func=options.__getitem__,
+                key=f"q_{question_number}",
+                index=None  # This prevents any option from being preselected
+            )
         
-        selected_option = st.radio(
-            "Choose your answer:",
-            options=range(len(current_q["options"])),
-            format_func=lambda x: current_q["options"][x],
-            key=f"q_{st.session_state.current_question}",
-            index=None  # This prevents any option from being preselected
-        )
-    
-    # Submit button with validation
-    col1, col2, col3 = st.columns([1, 1, 1])
-    with col2:
-        if selected_option is not None:
-            if st.button("Submit Answer", type="primary", use_container_width=True):
-                submit_answer(selected_option)
-                st.rerun()
-        else:
-            st.button("Submit Answer", type="primary", use_container_width=True, disabled=True)
-            st.caption("Please select an answer first")
+        # Submit button with validation
+        col1, col2, col3 = st.columns([1, 1, 1])
+        with col2:
+            submitted = st.form_submit_button("Submit Answer", type="primary", use_container_width=True)
+            if submitted and selected_option is None:
+                st.caption("Please select an answer first")
+    
+    if submitted and selected_option is not None:
+        submit_answer(selected_option)
+        st.rerun()
 
 # Quiz completed - Results screen with difficulty and category analysis
 else:
     st.balloons()
     
-    final_score = st.session_state.score
-    total_questions = len(st.session_state.quiz_questions)
+    quiz_questions = st.session_state.quiz_questions
+    answers = st.session_state.answers
+    
+    final_score = current_score()
+    total_questions = len(quiz_questions)
     percentage = (final_score / total_questions) * 100
     
-    # Calculate weighted score if using mixed difficulty
+    # Breakdowns and weighted score all come from a single pass over the answers
+    category_breakdown, difficulty_results, weighted_score, max_weighted = summarize_answers(answers, quiz_questions)
+    
+    # Weighted percentage is only shown for mixed difficulty
     if st.session_state.selected_difficulty == 'mixed':
-        weighted_score, max_weighted = calculate_difficulty_score(st.session_state.answers)
         weighted_percentage = (weighted_score / max_weighted) * 100 if max_weighted > 0 else 0
     
     # Results header
@@ -447,8 +529,8 @@ else:
         st.markdown("### 🏁 Quiz Complete!")
         
         # Show quiz settings
-        category_emoji = get_category_emoji(st.session_state.selected_category)
-        difficulty_emoji = get_difficulty_emoji(st.session_state.selected_difficulty) if st.session_state.selected_difficulty != 'mixed' else '🎲'
+        category_emoji = CATEGORY_EMOJIS.get(st.session_state.selected_category, '🎯')
+        difficulty_emoji = DIFFICULTY_EMOJIS.get(st.session_state.selected_difficulty, '⚪') if st.session_state.selected_difficulty != 'mixed' else '🎲'
         
         st.markdown(f"**Quiz Type:** {category_emoji} {st.session_state.selected_category.title()} • {difficulty_emoji} {st.session_state.selected_difficulty.title()}")
         
@@ -475,20 +557,11 @@ else:
     if st.session_state.selected_category == 'all':
         st.markdown("### 📊 Performance by Category")
         
-        category_breakdown = {}
-        for answer in st.session_state.answers:
-            cat = answer.get('category', 'Unknown')
-            if cat not in category_breakdown:
-                category_breakdown[cat] = [0, 0]  # [correct, total]
-            category_breakdown[cat][1] += 1  # total
-            if answer['is_correct']:
-                category_breakdown[cat][0] += 1  # correct
-        
         cols = st.columns(min(len(category_breakdown), 4))
         for i, (cat, (correct, total)) in enumerate(category_breakdown.items()):
             with cols[i % len(cols)]:
                 pct = (correct / total) * 100
-                cat_emoji = get_category_emoji(cat)
+                cat_emoji = CATEGORY_EMOJIS.get(cat, '🎯')
                 st.metric(
                     f"{cat_emoji} {cat.title()}", 
                     f"{correct}/{total} ({pct:.0f}%)"
@@ -498,21 +571,15 @@ else:
     if st.session_state.selected_difficulty == 'mixed':
         st.markdown("### 📈 Performance by Difficulty")
         
-        difficulty_breakdown = {'easy': [0, 0], 'medium': [0, 0], 'hard': [0, 0]}
-        for answer in st.session_state.answers:
-            diff = answer.get('difficulty', 'medium').lower()
-            if diff in difficulty_breakdown:
-                difficulty_breakdown[diff][1] += 1  # total
-                if answer['is_correct']:
-                    difficulty_breakdown[diff][0] += 1  # correct
-        
         cols = st.columns(3)
-        for i, (diff, (correct, total)) in enumerate(difficulty_breakdown.items()):
+        for i, diff in enumerate(('easy', 'medium', 'hard')):
+            correct = difficulty_results[diff, True]
+            total = correct + difficulty_results[diff, False]
             if total > 0:
                 with cols[i]:
                     pct = (correct / total) * 100
                     st.metric(
-                        f"{get_difficulty_emoji(diff)} {diff.title()}", 
+                        f"{DIFFICULTY_EMOJIS.get(diff, '⚪')} {diff.title()}", 
                         f"{correct}/{total} ({pct:.0f}%)"
                     )
     
@@ -520,28 +587,35 @@ else:
     st.markdown("---")
     st.markdown("### 📊 Detailed Results")
     
-    for i, answer in enumerate(st.session_state.answers, 1):
-        question_difficulty = answer.get('difficulty', 'medium')
-        question_category = answer.get('category', 'Unknown')
-        difficulty_emoji = get_difficulty_emoji(question_difficulty)
-        category_emoji = get_category_emoji(question_category)
+    # Only render the first few result cards until the user asks for the rest
+    shown_answers = answers if st.session_state.show_all_results else answers[:RESULTS_PREVIEW_COUNT]
+    
+    for i, (answer, question) in enumerate(zip(shown_answers, quiz_questions), 1):
+        options = question['options']
+        question_difficulty = question['_diff']
+        question_category = question['_cat']
+        difficulty_emoji = DIFFICULTY_EMOJIS.get(question_difficulty, '⚪')
+        category_emoji = CATEGORY_EMOJIS.get(question_category, '🎯')
         
         with st.expander(f"Question {i}: {'✅' if answer['is_correct'] else '❌'} {difficulty_emoji} {category_emoji} {question_category.title()}"):
-            st.markdown(f"**{answer['question']}**")
-            
-            col1, col2 = st.columns(2)
-            with col1:
-                st.markdown("**Your Answer:**")
-                if answer['is_correct']:
-                    st.success(st.session_state.quiz_questions[i-1]['options'][answer['selected']])
-                else:
-                    st.error(st.session_state.quiz_questions[i-1]['options'][answer['selected']])
-            
-            with col2:
-                st.markdown("**Correct Answer:**")
-                st.success(st.session_state.quiz_questions[i-1]['options'][answer['correct']])
-            
-            st.info(f"**Explanation:** {answer['explanation']}")
+            # One markdown element per card instead of one per line/box
+            selected_class = 'result-correct' if answer['is_correct'] else 'result-wrong'
+            st.markdown(
+                f"<p><strong>{html.escape(question['question'])}</strong></p>"
+                "<div class='result-answers'>"
+                "<div><p><strong>Your Answer:</strong></p>"
+                f"<div class='result-box {selected_class}'>{html.escape(options[answer['selected']])}</div></div>"
+                "<div><p><strong>Correct Answer:</strong></p>"
+                f"<div class='result-box result-correct'>{html.escape(options[question['correct']])}</div></div>"
+                "</div>"
+                f"<div class='result-box result-info'><strong>Explanation:</strong> {html.escape(question['explanation'])}</div>",
+                unsafe_allow_html=True
+            )
+    
+    if len(shown_answers) < len(answers):
+        if st.button(f"Show all {len(answers)} results"):
+            st.session_state.show_all_results = True
+            st.rerun()
     
     # Action buttons
     st.markdown("---")
@@ -561,26 +635,27 @@ else:
 with st.sidebar:
     st.markdown("### 🏁 About This Quiz")
     
-    if st.session_state.all_questions:
-        st.markdown(f"""
-        **Question Database:**
-        - Total Questions: {total_questions}
-        
-        **Difficulty Breakdown:**
-        """)
-        
-        # Show difficulty stats with emojis
-        for difficulty, count in difficulty_stats.items():
-            emoji = get_difficulty_emoji(difficulty)
-            st.markdown(f"- {emoji} {difficulty.title()}: {count} questions")
-        
-        st.markdown(f"""
-        **Quiz Format:**
-        - Up to 5 random questions per quiz
-        - Multiple choice format with instant feedback and explanations
-        - Choose your preferred difficulty level and category!
-        """)
+    # initialize_questions() stops the script when nothing loaded, so stats are always available here
+    st.markdown(f"""
+    **Question Database:**
+    - Total Questions: {question_index['total']}
     
+    **Difficulty Breakdown:**
+    """)
+    
+    # Show difficulty stats with emojis as a single markdown element
+    st.markdown("\n".join(
+        f"- {DIFFICULTY_EMOJIS.get(difficulty, '⚪')} {difficulty.title()}: {count} questions"
+        for difficulty, count in question_index['difficulty_stats'].items()
+    ))
+    
+    st.markdown(f"""
+    **Quiz Format:**
+    - Up to 5 random questions per quiz
+    - Multiple choice format with instant feedback and explanations
+    - Choose your preferred difficulty level and category!
+    """)
+
     st.markdown("""
     This NASCAR quiz tests your knowledge across different categories:
     - **History**: NASCAR's past and milestones
@@ -612,8 +687,8 @@ with st.sidebar:
         st.markdown("---")
         current_difficulty = st.session_state.selected_difficulty
         current_category = st.session_state.selected_category
-        difficulty_emoji = get_difficulty_emoji(current_difficulty) if current_difficulty != 'mixed' else '🎲'
-        category_emoji = get_category_emoji(current_category)
+        difficulty_emoji = DIFFICULTY_EMOJIS.get(current_difficulty, '⚪') if current_difficulty != 'mixed' else '🎲'
+        category_emoji = CATEGORY_EMOJIS.get(current_category, '🎯')
         
         st.markdown(f"**Current Quiz:**")
         st.markdown(f"- {category_emoji} Category: {current_category.title()}")
@@ -626,11 +701,7 @@ with st.sidebar:
     # File management section
     st.markdown("---")
     st.markdown("### 📁 Question File Info")
-    if st.session_state.all_questions:
-        st.success(f"✅ Questions loaded successfully")
-        if st.button("🔄 Reload Questions"):
-            st.session_state.questions_loaded = False
-            st.rerun()
-    else:
-        st.error("❌ Questions file not found")
-        st.markdown("Make sure `questions.json` is in the same directory.")
\ No newline at end of file
+    st.success(f"✅ Questions loaded successfully")
+    if st.button("🔄 Reload Questions"):
+        clear_question_cache()
+        st.rerun()
\ No newline at end of file